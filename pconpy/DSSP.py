@@ -49,6 +49,7 @@ __docformat__ = "restructuredtext en"
 import re
 from Bio._py3k import StringIO
 import subprocess
+import warnings
 
 from Bio.Data import SCOPData
 
@@ -129,6 +130,14 @@ def dssp_dict_from_pdb_file(in_file, DSSP="dssp"):
     p = subprocess.Popen([DSSP, in_file], universal_newlines=True,
                          stdout=subprocess.PIPE, stderr=subprocess.PIPE)
     out, err = p.communicate()
+
+    # Alert the user of any errors, rather than silently returning an empty
+    # dictionary.
+    if err.strip():
+        warnings.warn(err)
+        if not out.strip():
+            raise PDBException("DSSP failed to produce an output")
+
     out_dict, keys = _make_dssp_dict(StringIO(out))
     return out_dict, keys
 
@@ -0,0 +1,42 @@
+# cython: boundscheck=False, wraparound=False
+"""
+Compiled distance kernels, these are used by pconpy when the extension has been
+built (see ``setup.py``), otherwise the numba or scipy implementations are used.
+
+"""
+
+from cython.parallel import prange
+from libc.math cimport sqrtf
+
+
+def calc_pairwise_distances(float[::1] x, float[::1] y, float[::1] z,
+        float[:, ::1] mat):
+    """Compute the (L2) Euclidean distances between every pair of coordinates
+    into ``mat``, see ``pconpy.calc_pairwise_distances``.
+
+    Args:
+        x: The (n,) array of the x components of the coordinates.
+        y: The (n,) array of the y components of the coordinates.
+        z: The (n,) array of the z components of the coordinates.
+        mat: The (n, n) output array.
+
+    Returns:
+        ``None``.
+
+    """
+
+    cdef Py_ssize_t n = x.shape[0]
+    cdef Py_ssize_t i, j
+    cdef float dx, dy, dz
+
+    # Each row is computed in full so that the inner loop only reads and writes
+    # contiguous arrays and can be compiled into SIMD instructions.
+    for i in prange(n, nogil=True, schedule="static"):
+        for j in range(n):
+            dx = x[i] - x[j]
+            dy = y[i] - y[j]
+            dz = z[i] - z[j]
+
+            mat[i, j] = sqrtf(dx * dx + dy * dy + dz * dz)
+
+    return
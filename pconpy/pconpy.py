@@ -21,8 +21,16 @@ Options:
                                 angstroms).
     --plaintext                 Generate a plaintext distance/contact matrix
                                 and write to stdout (recommended for
-                                piping into other CLI programs).
+                                piping into other CLI programs). Contact
+                                and hydrogen bond maps are written as the
+                                list of contacting residue index pairs.
+    --dense                     Write the full contact/hydrogen bond
+                                matrix instead of the residue index pairs
+                                (with --plaintext).
     --asymmetric                Display the plot only in the upper-triangle.
+    --memmap                    Store the distance matrix in a temporary file
+                                rather than in memory (recommended for very
+                                large structures).
 
     --title TITLE               The title of the plot (optional).
     --xlabel <label>            X-axis label [default: Residue index].
@@ -58,6 +66,8 @@ mpl.use('Agg')
 import os
 import sys
 import re
+import math
+import functools
 import tempfile
 import numpy
 import pylab
@@ -67,10 +77,23 @@ from collections import defaultdict
 from itertools import product
 from itertools import combinations, combinations_with_replacement
 from docopt import docopt
+from scipy.spatial.distance import cdist
 
 import Bio.PDB
 import DSSP
 
+try:
+    import _dist
+except ImportError:
+    _dist = None
+
+try:
+    import numba
+    from numba import prange
+except ImportError:
+    numba = None
+    prange = range
+
 DSSP_MISSING_MSG = """
 WARNING:
 The `dssp` executable was not found.
@@ -80,18 +103,12 @@ DSSP can be downloaded from:
 
 """
 
-# Check if DSSP is installed
-if not spawn.find_executable("dssp"):
-    sys.stderr.write(DSSP_MISSING_MSG)
-    sys.exit(1)
-
-
 PWD = os.path.dirname(os.path.abspath(__file__))
 
 # The atom names of the backbone and sidechain atoms are based on those defined
 # in the `ProDy` module.
-BACKBONE_ATOMS = set(["CA", "C", "O", "N"])
-BACKBONE_FULL_ATOMS = set(['CA', 'C', 'O', 'N', 'H', 'H1', 'H2', 'H3', 'OXT'])
+BACKBONE_ATOMS = frozenset(["CA", "C", "O", "N"])
+BACKBONE_FULL_ATOMS = frozenset(['CA', 'C', 'O', 'N', 'H', 'H1', 'H2', 'H3', 'OXT'])
 
 # VDW radii values
 #
@@ -102,6 +119,19 @@ VDW_RADII = { "N" : 1.55, "C" : 1.70,"H" : 1.20, "O" : 1.52, "S": 1.85 }
 
 DSSP_HB_THRESH = -0.5
 
+# A single PDB parser is shared by every call to ``get_residues``, the PDB
+# headers are not parsed since they are not used.
+PDB_PARSER = Bio.PDB.PDBParser(PERMISSIVE=True, get_header=False)
+
+# The approximate number of atoms per block of residues in the blocked minvdw
+# distance calculation, the distances between a pair of blocks of this size
+# fit in the L2 cache.
+MINVDW_BLOCK_SIZE = 128
+
+# The number of matrix rows per block in the blocked pairwise distance
+# calculation.
+PAIRWISE_BLOCK_SIZE = 128
+
 #
 # BioPython enhancements
 #
@@ -115,7 +145,7 @@ def is_sidechain(atom):
 
 
 def get_backbone_atoms(res):
-    return filter(lambda atom : is_backbone(atom), res.get_iterator())
+    return [atom for atom in res if atom.get_id() in BACKBONE_ATOMS]
 
 
 def get_sidechain_atoms(res, infer_CB=False):
@@ -130,7 +160,7 @@ def get_sidechain_atoms(res, infer_CB=False):
         A list of Bio.PDB.Residue objects.
 
     """
-    atoms = filter(lambda atom : is_sidechain(atom), res.get_iterator())
+    atoms = [atom for atom in res if atom.get_id() not in BACKBONE_FULL_ATOMS]
 
     if (not atoms):
         if infer_CB:
@@ -146,14 +176,16 @@ def get_sidechain_atoms(res, infer_CB=False):
     return atoms
 
 
-def get_residues(pdb_fn, chain_ids=None, model_num=0):
+def get_residues(pdb_fn, chain_ids=None, model_num=0, dssp="dssp"):
     """Build a simple list of residues from a single chain of a PDB file.
 
     Args:
         pdb_fn: The path to a PDB file.
         chain_ids: A list of single-character chain identifiers.
-        dssp: Path to the dssp executable (optional).
         model_num: The model number in the PDB file to use (optional)
+        dssp: Path to the dssp executable, or None to skip the DSSP hydrogen
+            bond assignment, which is only required by ``is_hbond``
+            (optional).
 
     Returns:
         A list of Bio.PDB.Residue objects.
@@ -162,10 +194,16 @@ def get_residues(pdb_fn, chain_ids=None, model_num=0):
 
     pdb_id = os.path.splitext(os.path.basename(pdb_fn))[0]
 
-    parser = Bio.PDB.PDBParser(pdb_id, pdb_fn)
-    struct = parser.get_structure(pdb_id, pdb_fn)
+    struct = PDB_PARSER.get_structure(pdb_id, pdb_fn)
     model = struct[model_num]
-    dssp = DSSP.DSSP(model, pdb_fn)
+
+    if dssp is not None:
+        # Check if DSSP is installed
+        if not spawn.find_executable(dssp):
+            sys.stderr.write(DSSP_MISSING_MSG)
+            sys.exit(1)
+
+        DSSP.DSSP(model, pdb_fn, dssp=dssp)
 
     if chain_ids is None:
         # get residues from every chain.
@@ -180,7 +218,7 @@ def get_residues(pdb_fn, chain_ids=None, model_num=0):
     # - non-amino acids
     # - non-standard amino acids
     for ch in chains:
-        for res in filter(lambda r : Bio.PDB.is_aa(r), ch.get_residues()):
+        for res in (r for r in ch if Bio.PDB.is_aa(r)):
             if not Bio.PDB.is_aa(res, standard=True):
                 sys.stderr.write("WARNING: non-standard AA at %r%s"
                         % (res.get_id(), os.linesep))
@@ -189,6 +227,35 @@ def get_residues(pdb_fn, chain_ids=None, model_num=0):
     return residues
 
 
+def calc_virtual_cb_coords(N, CA, C):
+    """Infer the virtual CB atom coordinates of a set of residues from their
+    backbone atoms, using the method described in http://goo.gl/OaNjxe.
+
+    Args:
+        N: An (n, 3) array of the N atom coordinates.
+        CA: An (n, 3) array of the CA atom coordinates.
+        C: An (n, 3) array of the C atom coordinates.
+
+    Returns:
+        An (n, 3) array of the virtual CB atom coordinates.
+
+    """
+
+    CA_N = numpy.asarray(N, dtype="float64") - CA
+    CA_C = numpy.asarray(C, dtype="float64") - CA
+
+    # Rotate CA->N by -120 degrees about the CA->C axis (Rodrigues' rotation
+    # formula).
+    theta = -numpy.pi * 120.0 / 180.0
+    k = CA_C / numpy.linalg.norm(CA_C, axis=1)[:, numpy.newaxis]
+    k_dot_v = numpy.einsum("ij,ij->i", k, CA_N)[:, numpy.newaxis]
+
+    CA_CB = CA_N * numpy.cos(theta) + numpy.cross(k, CA_N) * numpy.sin(theta) \
+                + k * k_dot_v * (1.0 - numpy.cos(theta))
+
+    return CA + CA_CB
+
+
 def get_atom_coord(res, atom_name, verbose=False):
     """Get the atomic coordinate of a single atom in a residue. This function wraps the
     ``Bio.PDB.Residue.get_coord()`` function to infer CB coordinates if required.
@@ -224,22 +291,101 @@ def get_atom_coord(res, atom_name, verbose=False):
         assert("CA" in res)
         assert("C" in res)
 
-        # Infer the CB atom position described in http://goo.gl/OaNjxe
-        #
-        # NOTE:
-        # These are Bio.PDB.Vector objects and _not_ numpy arrays.
-        N = res["N"].get_vector()
-        CA = res["CA"].get_vector()
-        C = res["C"].get_vector()
+        N, CA, C = [res[name].get_coord()[numpy.newaxis]
+                        for name in ("N", "CA", "C")]
 
-        CA_N = N - CA
-        CA_C = C - CA
+        coord = calc_virtual_cb_coords(N, CA, C)[0]
 
-        rot_mat = Bio.PDB.rotaxis(-numpy.pi * 120.0 / 180.0, CA_C)
+    return coord
 
-        coord = (CA + CA_N.left_multiply(rot_mat)).get_array()
 
-    return coord
+def get_atom_coords(residues, atom_name):
+    """Get the atomic coordinates of a single atom from each residue, see
+    ``get_atom_coord``.
+
+    Args:
+        residues: A list of ``Bio.PDB.Residue`` objects.
+        atom_name: The name of the atom (e.g. "CA" for alpha-carbon).
+
+    Returns:
+        An (n, 3) array of the coordinates of the specified atom in each of
+        the n residues.
+
+    """
+
+    if atom_name != "CB":
+        return numpy.array([get_atom_coord(res, atom_name) for res in residues],
+                    dtype="float32").reshape(-1, 3)
+
+    coords = numpy.empty((len(residues), 3), dtype="float32")
+    virtual = []
+
+    for i, res in enumerate(residues):
+        if "CB" in res:
+            coords[i] = res["CB"].get_coord()
+        else:
+            virtual.append(i)
+
+    # Infer the missing CB atoms (e.g. of glycines) all at once.
+    if virtual:
+        N, CA, C = [numpy.array([residues[i][name].get_coord() for i in virtual])
+                        for name in ("N", "CA", "C")]
+        coords[virtual] = calc_virtual_cb_coords(N, CA, C)
+
+    return coords
+
+
+def get_atom_arrays(res):
+    """Get the coordinates, masses and VDW radii of the atoms in a residue.
+
+    Args:
+        res: A ``Bio.PDB.Residue`` object.
+
+    Returns:
+        A ``(coords, masses, radii)`` tuple of the (k, 3) array of atomic
+        coordinates, and the (k,) arrays of atomic masses and VDW radii of the k
+        atoms in ``res``.
+
+    """
+
+    atoms = res.get_list()
+    coords = numpy.array([a.get_coord() for a in atoms],
+                dtype="float32").reshape(-1, 3)
+    masses = numpy.array([a.mass for a in atoms], dtype="float32")
+    radii = numpy.array([VDW_RADII.get(a.get_id()[0], 0.0) for a in atoms],
+                dtype="float32")
+
+    return coords, masses, radii
+
+
+def residues_to_soa(residues):
+    """Extract the atoms of a list of residues into contiguous arrays, where the
+    atoms of each residue are stored consecutively.
+
+    Args:
+        residues: A list of ``Bio.PDB.Residue`` objects.
+
+    Returns:
+        A ``(coords, masses, radii, offsets)`` tuple of the (m, 3) array of
+        atomic coordinates, the (m,) arrays of atomic masses and VDW radii of
+        all the m atoms, and the (n + 1,) array of offsets such that the
+        atoms of the i-th residue are at ``offsets[i]:offsets[i+1]``.
+
+    """
+
+    arrays = [get_atom_arrays(res) for res in residues]
+
+    coords = numpy.concatenate([numpy.zeros((0, 3), dtype="float32")]
+                + [a[0] for a in arrays])
+    masses = numpy.concatenate([numpy.zeros(0, dtype="float32")]
+                + [a[1] for a in arrays])
+    radii = numpy.concatenate([numpy.zeros(0, dtype="float32")]
+                + [a[2] for a in arrays])
+
+    offsets = numpy.zeros(len(residues) + 1, dtype="int64")
+    offsets[1:] = numpy.cumsum([len(a[0]) for a in arrays])
+
+    return coords, masses, radii, offsets
 
 
 def get_hbond_info(res):
@@ -379,6 +525,26 @@ def init_pylab(font_kwargs={}):
 # Geometry
 #
 
+def calc_eucl_distance(A, B):
+    """Compute the (L2) Euclidean distance between a pair of 3D coordinates.
+
+    Args:
+        A: A 3D coordinate.
+        B: A 3D coordinate.
+
+    Returns:
+        The distance between ``A`` and ``B``.
+
+    """
+
+    # This is considerably faster than ``numpy.linalg.norm`` for 3D vectors.
+    d0 = A[0] - B[0]
+    d1 = A[1] - B[1]
+    d2 = A[2] - B[2]
+
+    return math.sqrt(d0 * d0 + d1 * d1 + d2 * d2)
+
+
 def calc_center_of_mass(atoms):
     """Compute the center of mass from a collection of atoms.
 
@@ -390,10 +556,74 @@ def calc_center_of_mass(atoms):
 
     """
 
-    coords = [a.get_coord() for a in atoms]
-    weights = [a.mass for a in atoms]
+    coords = numpy.array([a.get_coord() for a in atoms], dtype="float64")
+    masses = numpy.fromiter((a.mass for a in atoms), dtype="float64",
+                count=len(atoms))
+
+    return numpy.average(coords, weights=masses, axis=0)
+
+
+def calc_centers_of_mass(residues, sidechain_only=False):
+    """Compute the center of mass of each residue in a list of residues.
+
+    Args:
+        residues: A list of ``Bio.PDB.Residue`` objects.
+        sidechain_only: Set to True to consider only the sidechain atoms, False
+            otherwise (optional).
 
-    return numpy.average(coords, weights=weights, axis=0)
+    Returns:
+        An (n, 3) array of the centers of mass of each of the n residues.
+
+    """
+
+    if sidechain_only:
+        atom_lists = (get_sidechain_atoms(res) for res in residues)
+    else:
+        atom_lists = (res.get_list() for res in residues)
+
+    return numpy.array([calc_center_of_mass(atoms) for atoms in atom_lists],
+                dtype="float32").reshape(-1, 3)
+
+
+def njit(**kwargs):
+    """Compile a function into machine code using ``numba.njit``, if numba is
+    installed, otherwise the function is left as-is.
+
+    Args:
+        **kwargs: Keyword arguments passed on to ``numba.njit``.
+
+    Returns:
+        A function decorator.
+
+    """
+
+    if numba is None:
+        return lambda func: func
+
+    return numba.njit(**kwargs)
+
+
+@njit(fastmath=True, cache=True)
+def _calc_minvdw_distance(coords_a, radii_a, coords_b, radii_b):
+    """Compute the minimum VDW distance between two sets of atoms, see
+    ``calc_minvdw_distance``.
+
+    """
+
+    min_dist = numpy.inf
+
+    for i in range(coords_a.shape[0]):
+        for j in range(coords_b.shape[0]):
+            dx = coords_a[i, 0] - coords_b[j, 0]
+            dy = coords_a[i, 1] - coords_b[j, 1]
+            dz = coords_a[i, 2] - coords_b[j, 2]
+
+            dist = math.sqrt(dx * dx + dy * dy + dz * dz) - radii_a[i] - radii_b[j]
+
+            if dist < min_dist:
+                min_dist = dist
+
+    return min_dist
 
 
 def calc_minvdw_distance(res_a, res_b):
@@ -409,22 +639,89 @@ def calc_minvdw_distance(res_a, res_b):
 
     """
 
-    min_dist = None
+    coords_a, _, radii_a = get_atom_arrays(res_a)
+    coords_b, _, radii_b = get_atom_arrays(res_b)
 
-    for a in res_a.get_iterator():
-        for b in res_b.get_iterator():
-            radii_a = VDW_RADII.get(a.get_id()[0], 0.0)
-            radii_b = VDW_RADII.get(b.get_id()[0], 0.0)
+    return _calc_minvdw_distance(coords_a, radii_a, coords_b, radii_b)
 
-            A = a.get_coord()
-            B = b.get_coord()
 
-            dist = numpy.linalg.norm(A - B) - radii_a - radii_b
+def alloc_matrix(n, memmap=False):
+    """Allocate an uninitialised (n, n) distance matrix.
 
-            if (min_dist is None) or dist < min_dist:
-                min_dist = dist
+    Args:
+        n: The number of rows and columns.
+        memmap: Set to True to store the matrix in a temporary memory-mapped
+            file rather than in memory, which is deleted once the matrix is no
+            longer used (optional).
 
-    return min_dist
+    Returns:
+        An (n, n) array.
+
+    """
+
+    if memmap and n > 0:
+        return numpy.memmap(tempfile.TemporaryFile(), dtype="float32",
+                    mode="w+", shape=(n, n))
+
+    return numpy.empty((n, n), dtype="float32")
+
+
+def calc_minvdw_matrix(coords, radii, offsets, block_size=MINVDW_BLOCK_SIZE,
+        out=None):
+    """Compute the minimum VDW distance between every pair of residues, see
+    ``calc_minvdw_distance``.
+
+    Args:
+        coords: An (m, 3) array of atomic coordinates.
+        radii: An (m,) array of VDW radii.
+        offsets: An (n + 1,) array of residue offsets into ``coords`` and
+            ``radii``, see ``residues_to_soa``.
+        block_size: The approximate number of atoms per block of residues
+            (optional).
+        out: An (n, n) array in which to store the distances, see
+            ``alloc_matrix`` (optional).
+
+    Returns:
+        An (n, n) array of the minimum VDW distances between each pair of
+        residues.
+
+    """
+
+    n = len(offsets) - 1
+    mat = alloc_matrix(n) if out is None else out
+
+    if n == 0:
+        return mat
+
+    # Group consecutive residues into blocks of about ``block_size`` atoms.
+    blocks = [0]
+
+    for i in range(1, n):
+        if offsets[i + 1] - offsets[blocks[-1]] > block_size:
+            blocks.append(i)
+
+    blocks.append(n)
+    blocks = list(zip(blocks[:-1], blocks[1:]))
+
+    # Compute the atomic distances between each pair of blocks, then reduce
+    # them to the minimum distance between each pair of residues.
+    for bi, (r0, r1) in enumerate(blocks):
+        a0, a1 = offsets[r0], offsets[r1]
+
+        for s0, s1 in blocks[bi:]:
+            b0, b1 = offsets[s0], offsets[s1]
+
+            dist = cdist(coords[a0:a1], coords[b0:b1])
+            dist -= radii[a0:a1, numpy.newaxis]
+            dist -= radii[numpy.newaxis, b0:b1]
+
+            dist = numpy.minimum.reduceat(dist, offsets[r0:r1] - a0, axis=0)
+            dist = numpy.minimum.reduceat(dist, offsets[s0:s1] - b0, axis=1)
+
+            mat[r0:r1, s0:s1] = dist
+            mat[s0:s1, r0:r1] = dist.T
+
+    return mat
 
 
 def calc_cmass_distance(res_a, res_b, sidechain_only=False):
@@ -451,7 +748,107 @@ def calc_cmass_distance(res_a, res_b, sidechain_only=False):
     A = calc_center_of_mass(atoms_a)
     B = calc_center_of_mass(atoms_b)
 
-    return numpy.linalg.norm(A-B)
+    return calc_eucl_distance(A, B)
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _calc_pairwise_distances(x, y, z, mat):
+    """Compute the (L2) Euclidean distances between every pair of coordinates
+    into ``mat``, see ``calc_pairwise_distances``.
+
+    """
+
+    n = x.shape[0]
+
+    # Each row is computed in full, rather than mirroring the upper-triangle,
+    # so that the inner loop only reads and writes contiguous arrays and can
+    # be compiled into SIMD instructions.
+    for i in prange(n):
+        xi = x[i]
+        yi = y[i]
+        zi = z[i]
+
+        for j in range(n):
+            dx = xi - x[j]
+            dy = yi - y[j]
+            dz = zi - z[j]
+
+            mat[i, j] = math.sqrt(dx * dx + dy * dy + dz * dz)
+
+
+def calc_pairwise_distances(coords, out=None):
+    """Compute the (L2) Euclidean distances between every pair of coordinates.
+
+    Args:
+        coords: An (n, 3) array of atomic coordinates.
+        out: An (n, n) array in which to store the distances, see
+            ``alloc_matrix`` (optional).
+
+    Returns:
+        An (n, n) array of the distances between each pair of coordinates.
+
+    """
+
+    n = len(coords)
+    mat = alloc_matrix(n) if out is None else out
+
+    if n == 0:
+        return mat
+
+    if (_dist is not None) or (numba is not None):
+        # The rows are computed in parallel from the separate x, y and z
+        # components of the coordinates, using the compiled extension if it
+        # was built, otherwise numba.
+        x, y, z = [numpy.ascontiguousarray(coords[:, k], dtype="float32")
+                    for k in range(3)]
+
+        if _dist is not None:
+            _dist.calc_pairwise_distances(x, y, z, mat)
+        else:
+            _calc_pairwise_distances(x, y, z, mat)
+
+        return mat
+
+    # The rows are computed block-by-block, this is faster than ``pdist`` and
+    # ``squareform`` and only requires a small temporary array per block.
+    for i in range(0, n, PAIRWISE_BLOCK_SIZE):
+        mat[i:i+PAIRWISE_BLOCK_SIZE] = \
+            cdist(coords[i:i+PAIRWISE_BLOCK_SIZE], coords)
+
+    return mat
+
+
+def calc_atom_distance(res_a, res_b, atom_name):
+    """Compute the distance between the same atom of two residues, see
+    ``get_atom_coord``.
+
+    Args:
+        res_a: A ``Bio.PDB.Residue`` object.
+        res_b: A ``Bio.PDB.Residue`` object.
+        atom_name: The name of the atom (e.g. "CA" for alpha-carbon).
+
+    Returns:
+        The distance between the ``atom_name`` atoms of ``res_a`` and
+        ``res_b``.
+
+    """
+
+    A = get_atom_coord(res_a, atom_name)
+    B = get_atom_coord(res_b, atom_name)
+
+    return calc_eucl_distance(A, B)
+
+
+# The function that computes the distance between a pair of residues for each
+# inter-residue distance measure.
+MEASURE_FUNCS = {
+    "CA" : functools.partial(calc_atom_distance, atom_name="CA"),
+    "CB" : functools.partial(calc_atom_distance, atom_name="CB"),
+    "cmass" : calc_cmass_distance,
+    "sccmass" : functools.partial(calc_cmass_distance, sidechain_only=True),
+    "minvdw" : calc_minvdw_distance,
+    "hb" : is_hbond
+}
 
 
 def calc_distance(res_a, res_b, measure="CA"):
@@ -468,26 +865,16 @@ def calc_distance(res_a, res_b, measure="CA"):
 
     """
 
-    if measure in ("CA", "CB"):
-        A = get_atom_coord(res_a, measure)
-        B = get_atom_coord(res_b, measure)
-        dist = numpy.linalg.norm(A-B)
-    elif measure == "cmass":
-        dist = calc_cmass_distance(res_a, res_b)
-    elif measure == "sccmass":
-        dist = calc_cmass_distance(res_a, res_b, sidechain_only=True)
-    elif measure == "minvdw":
-        dist = calc_minvdw_distance(res_a, res_b)
-    elif measure == "hb":
-        dist = is_hbond(res_a, res_b)
-    else:
+    try:
+        dist_func = MEASURE_FUNCS[measure]
+    except KeyError:
         raise NotImplementedError
 
-    return dist
+    return dist_func(res_a, res_b)
 
 
 def calc_dist_matrix(residues, measure="CA", dist_thresh=None,
-        mask_thresh=None, asymmetric=False):
+        mask_thresh=None, asymmetric=False, memmap=False):
     """Calculate the distance matrix for a list of residues.
 
     Args:
@@ -496,39 +883,65 @@ def calc_dist_matrix(residues, measure="CA", dist_thresh=None,
         dist_thresh: (optional).
         mask_thresh: (optional).
         asymmetric: (optional).
+        memmap: Set to True to store the underlying distance matrix in a
+            temporary memory-mapped file, for very large structures
+            (optional).
 
     Returns:
         The distance matrix as a masked array.
 
     """
 
-    mat = numpy.zeros((len(residues), len(residues)), dtype="float64")
+    mat = alloc_matrix(len(residues), memmap=memmap)
+
+    if measure in ("CA", "CB"):
+        # Single-atom measures are computed over all the residue pairs at
+        # once.
+        calc_pairwise_distances(get_atom_coords(residues, measure), out=mat)
+    elif measure in ("cmass", "sccmass"):
+        # Compute the center of mass of each residue once, rather than once
+        # per residue pair.
+        centers = calc_centers_of_mass(residues,
+                    sidechain_only=(measure == "sccmass"))
+        calc_pairwise_distances(centers, out=mat)
+    elif measure == "minvdw":
+        coords, _, radii, offsets = residues_to_soa(residues)
+        calc_minvdw_matrix(coords, radii, offsets, out=mat)
+    else:
+        try:
+            dist_func = MEASURE_FUNCS[measure]
+        except KeyError:
+            raise NotImplementedError
+
+        # Every measure is symmetric, so only the upper-triangle is computed
+        # and then mirrored into the lower-triangle.
+        #
+        # TODO:
+        # - parallelise this over multiple processes + show benchmark results.
+        pair_indices = combinations_with_replacement(range(len(residues)), 2)
 
-    # after the distances are added to the upper-triangle, the nan values
-    # indicate the lower matrix values, which are "empty", but can be used to
-    # convey other information if needed.
-    mat[:] = numpy.nan
+        for i, j in pair_indices:
+            res_a = residues[i]
+            res_b = residues[j]
+            mat[i,j] = mat[j,i] = dist_func(res_a, res_b)
 
-    # Compute the upper-triangle of the underlying distance matrix.
+    # the nan values indicate the lower matrix values, which are "empty", but
+    # can be used to convey other information if needed.
     #
     # TODO:
-    # - parallelise this over multiple processes + show benchmark results.
     # - use the lower-triangle to convey other information.
-    pair_indices = combinations_with_replacement(range(len(residues)), 2)
-
-    for i, j in pair_indices:
-        res_a = residues[i]
-        res_b = residues[j]
-        dist = calc_distance(res_a, res_b, measure)
-        mat[i,j] = dist
-
-        if not asymmetric:
-            mat[j,i] = dist
+    if asymmetric:
+        for i in range(len(residues)):
+            mat[i,:i] = numpy.nan
 
     # transpose i with j so the distances are contained only in the
     # upper-triangle.
     mat = mat.T
-    mat = numpy.ma.masked_array(mat, numpy.isnan(mat))
+
+    if asymmetric:
+        mat = numpy.ma.masked_array(mat, numpy.isnan(mat))
+    else:
+        mat = numpy.ma.masked_array(mat)
 
     if dist_thresh is not None:
         mat = mat < dist_thresh
@@ -539,6 +952,53 @@ def calc_dist_matrix(residues, measure="CA", dist_thresh=None,
     return mat
 
 
+def get_contacts(mat):
+    """Get the residue index pairs of the contacts in a contact matrix.
+
+    Args:
+        mat: A contact matrix as a masked array, see ``calc_dist_matrix``.
+
+    Returns:
+        An (m, 2) array of the m ``(i, j)`` residue index pairs in contact,
+        where ``i < j``.
+
+    """
+
+    contacts = mat.filled(0).astype(bool)
+
+    # Contacts are symmetric, asymmetric matrices only contain one of the
+    # triangles.
+    contacts = numpy.triu(contacts | contacts.T, 1)
+
+    return numpy.column_stack(numpy.nonzero(contacts))
+
+
+def write_contact_matrix(fn, mat):
+    """Write a contact matrix to a plaintext file, this is equivalent to
+    ``numpy.savetxt(fn, mat, fmt="%d")`` but without formatting each value.
+
+    Args:
+        fn: The path to the output file.
+        mat: A contact matrix of zeros and ones.
+
+    Returns:
+        ``None``.
+
+    """
+
+    # Each row of the output is the space-separated digits of a matrix row.
+    buf = numpy.empty((mat.shape[0], 2 * mat.shape[1]), dtype="uint8")
+    buf[:, 0::2] = ord("0") + (mat != 0)
+    buf[:, 1::2] = ord(" ")
+
+    if buf.size:
+        buf[:, -1] = ord("\n")
+
+    with open(fn, "wb") as f:
+        buf.tofile(f)
+
+    return
+
 
 if __name__ == '__main__':
     opts = docopt(__doc__)
@@ -563,22 +1023,25 @@ if __name__ == '__main__':
     else:
         measure = opts["--measure"]
 
-    residues = get_residues(opts["--pdb"], chain_ids=chain_ids)
+    # DSSP is only needed for the hydrogen bond information.
+    residues = get_residues(opts["--pdb"], chain_ids=chain_ids,
+            dssp=("dssp" if opts["hbmap"] else None))
 
     #
     # Generate the underlying 2D matrix for the selected plot.
     #
     mat = calc_dist_matrix(residues, measure=measure,
             dist_thresh=opts["<dist>"], mask_thresh=opts["--mask-thresh"],
-            asymmetric=opts["--asymmetric"])
+            asymmetric=opts["--asymmetric"], memmap=opts["--memmap"])
 
     if opts["--plaintext"]:
-        if opts["cmap"] or opts["hbmap"]:
-            fmt = "%d"
+        if (opts["cmap"] or opts["hbmap"]) and not opts["--dense"]:
+            # Contact matrices are sparse, so only the contacts are written.
+            numpy.savetxt(opts["--output"], get_contacts(mat), fmt="%d")
+        elif opts["cmap"] or opts["hbmap"]:
+            write_contact_matrix(opts["--output"], mat.filled(0))
         else:
-            fmt = "%.3f"
-
-        numpy.savetxt(opts["--output"], mat.filled(0), fmt=fmt)
+            numpy.savetxt(opts["--output"], mat.filled(0), fmt="%.3f")
     else:
         font_kwargs = {
                 "family" : opts["--font-family"],
@@ -1,4 +1,18 @@
-from setuptools import setup
+from setuptools import setup, Extension
+
+# The compiled distance kernels are optional, they are only built if Cython is
+# available.
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    ext_modules = []
+else:
+    ext_modules = cythonize([
+        Extension("pconpy._dist", ["pconpy/_dist.pyx"],
+            extra_compile_args=["-O3", "-march=native", "-ffast-math",
+                "-fopenmp"],
+            extra_link_args=["-fopenmp"])
+    ])
 
 setup(name="pconpy",
     version="0.1",
@@ -8,6 +22,7 @@ setup(name="pconpy",
     url="http://www.github.com/kianho/pconpy",
     license="MIT",
     packages=["pconpy"],
+    ext_modules=ext_modules,
     keywords=["protein", "protein structure", "bioinformatics", "contact map",
         "distance map", "computational biology", "visualization",
         "visualisation", "amino acids"],
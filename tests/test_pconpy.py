@@ -19,6 +19,7 @@ Usage:
 
 import os
 import sys
+import tempfile
 
 import pconpy
 import numpy
@@ -74,3 +75,149 @@ class TestGeometry:
         # Test each of the distance metrics on the ideal and edge cases.
         for metric in ("CA", "CB", "cmass", "sccmass", "minvdw"):
             yield run_test, metric
+
+
+    def test_calc_pairwise_distances(self):
+        """Test the vectorised pairwise distances against the per-pair norms.
+
+        """
+
+        pdb_fn = self.pdb_id_to_fn("1ubq")
+        residues = pconpy.get_residues(pdb_fn)
+        coords = numpy.array([pconpy.get_atom_coord(res, "CA")
+                    for res in residues], dtype="float64")
+        mat = pconpy.calc_pairwise_distances(coords)
+
+        assert( mat.shape == (len(residues), len(residues)) )
+        assert( numpy.allclose(mat, mat.T) )
+
+        for i, j in [(0, 1), (3, 40), (len(residues) - 1, 0)]:
+            dist = numpy.linalg.norm(coords[i] - coords[j])
+            assert( numpy.isclose(mat[i,j], dist) )
+
+        return
+
+
+    def test_residues_to_soa(self):
+        """Test the extraction of residue atoms into contiguous arrays.
+
+        """
+
+        pdb_fn = self.pdb_id_to_fn("1ubq")
+        residues = pconpy.get_residues(pdb_fn)
+        coords, masses, radii, offsets = pconpy.residues_to_soa(residues)
+
+        assert( len(offsets) == len(residues) + 1 )
+        assert( coords.shape == (offsets[-1], 3) )
+        assert( masses.shape == radii.shape == (offsets[-1],) )
+
+        for i, res in enumerate(residues):
+            res_coords = coords[offsets[i]:offsets[i+1]]
+            assert( numpy.allclose(res_coords,
+                        [a.get_coord() for a in res.get_list()]) )
+
+        return
+
+
+    def test_get_contacts(self):
+        """Test the extraction of residue contact pairs from a contact matrix.
+
+        """
+
+        pdb_fn = self.pdb_id_to_fn("1ubq")
+        residues = pconpy.get_residues(pdb_fn)
+
+        for asymmetric in (False, True):
+            mat = pconpy.calc_dist_matrix(residues, "CA", dist_thresh=8.0,
+                    asymmetric=asymmetric)
+            contacts = pconpy.get_contacts(mat)
+
+            assert( contacts.shape[1] == 2 )
+            assert( numpy.all(contacts[:,0] < contacts[:,1]) )
+
+            # Adjacent residues are always in contact.
+            assert( [0, 1] in contacts.tolist() )
+
+        return
+
+
+    def test_calc_minvdw_matrix(self):
+        """Test the blocked minvdw distances against the per-pair distances.
+
+        """
+
+        pdb_fn = self.pdb_id_to_fn("1ubq")
+        residues = pconpy.get_residues(pdb_fn)
+        coords, _, radii, offsets = pconpy.residues_to_soa(residues)
+
+        # Use small blocks so that residue pairs span many blocks.
+        mat = pconpy.calc_minvdw_matrix(coords, radii, offsets, block_size=16)
+
+        assert( mat.shape == (len(residues), len(residues)) )
+
+        for i, j in [(0, 0), (0, 1), (3, 40), (len(residues) - 1, 0)]:
+            dist = pconpy.calc_minvdw_distance(residues[i], residues[j])
+            assert( numpy.isclose(mat[i,j], dist) )
+
+        return
+
+
+    def test_calc_virtual_cb_coords(self):
+        """Test that the virtual CB coordinates are close to the actual CB
+        coordinates.
+
+        """
+
+        pdb_fn = self.pdb_id_to_fn("1ubq")
+        residues = [res for res in pconpy.get_residues(pdb_fn) if "CB" in res]
+
+        N, CA, C, CB = [numpy.array([res[name].get_coord() for res in residues])
+                            for name in ("N", "CA", "C", "CB")]
+        virtual_CB = pconpy.calc_virtual_cb_coords(N, CA, C)
+
+        assert( virtual_CB.shape == CB.shape )
+        assert( numpy.all(numpy.linalg.norm(virtual_CB - CB, axis=1) < 0.5) )
+
+        return
+
+
+    def test_write_contact_matrix(self):
+        """Test that contact matrices are written in the same format as
+        ``numpy.savetxt``.
+
+        """
+
+        pdb_fn = self.pdb_id_to_fn("1ubq")
+        residues = pconpy.get_residues(pdb_fn)
+        mat = pconpy.calc_dist_matrix(residues, "CA", dist_thresh=8.0)
+
+        tmp_dir = tempfile.mkdtemp()
+        fn = os.path.join(tmp_dir, "cmap.txt")
+        ref_fn = os.path.join(tmp_dir, "cmap_ref.txt")
+
+        pconpy.write_contact_matrix(fn, mat.filled(0))
+        numpy.savetxt(ref_fn, mat.filled(0), fmt="%d")
+
+        with open(fn) as f, open(ref_fn) as ref_f:
+            assert( f.read() == ref_f.read() )
+
+        return
+
+
+    def test_calc_dist_matrix_memmap(self):
+        """Test that memory-mapped distance matrices are the same as in-memory
+        distance matrices.
+
+        """
+
+        pdb_fn = self.pdb_id_to_fn("1ubq")
+        residues = pconpy.get_residues(pdb_fn)
+
+        for measure in ("CA", "minvdw"):
+            mat = pconpy.calc_dist_matrix(residues, measure)
+            mmap_mat = pconpy.calc_dist_matrix(residues, measure, memmap=True)
+
+            assert( isinstance(mmap_mat.data, numpy.memmap) )
+            assert( numpy.array_equal(mat, mmap_mat) )
+
+        return